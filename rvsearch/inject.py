@@ -13,6 +13,38 @@ from .periodogram import TqdmUpTo
 import rvsearch.utils
 
 
+# Per-process state for Injections.run_injections workers, populated once
+# by _init_injection_worker.
+_injection_worker = {}
+
+
+def _init_injection_worker(searchpath, full_grid, verbose):
+    """Read the saved search once per worker process."""
+    with open(searchpath, 'rb') as sfile:
+        _injection_worker['search'] = sfile.read()
+    _injection_worker['full_grid'] = full_grid
+    _injection_worker['verbose'] = verbose
+
+
+def _run_one(orbel):
+    """Inject and recover a single planet on a fresh copy of the search."""
+    search = pickle.loads(_injection_worker['search'])
+    search.verbose = False
+
+    recovered, recovered_orbel = search.inject_recover(orbel, num_cpus=1,
+                                                       full_grid=_injection_worker['full_grid'])
+
+    last_bic = max(search.best_bics.keys())
+    bic = search.best_bics[last_bic]
+    thresh = search.bic_threshes[last_bic]
+
+    if _injection_worker['verbose']:
+        counter.value += 1
+        pbar.update_to(counter.value)
+
+    return recovered, recovered_orbel, bic, thresh
+
+
 class Injections(object):
     """
     Class to perform and record injection and recovery tests for a planetary system.
@@ -64,30 +96,31 @@ class Injections(object):
         num_sim = self.num_sim
         beta_e = self.beta_e
 
-        np.random.seed(seed)
+        rng = np.random.default_rng(seed)
 
-        if p1 == p2:
-            sim_p = np.zeros(num_sim) + p1
-        else:
-            sim_p = 10 ** np.random.uniform(np.log10(p1), np.log10(p2), size=num_sim)
-
-        if k1 == k2:
-            sim_k = np.zeros(num_sim) + k1
-        else:
-            sim_k = 10 ** np.random.uniform(np.log10(k1), np.log10(k2), size=num_sim)
+        # Periods and semi-amplitudes are fixed at the limit for a degenerate
+        # range (which may be zero) and otherwise drawn log-uniform together.
+        lims = np.array([[p1, p2], [k1, k2]], dtype=float)
+        sim_pk = np.zeros((num_sim, 2)) + lims[:, 0]
+        draw = lims[:, 0] != lims[:, 1]
+        if draw.any():
+            loglims = np.log10(lims[draw])
+            sim_pk[:, draw] = 10 ** rng.uniform(loglims[:, 0], loglims[:, 1],
+                                                size=(num_sim, draw.sum()))
+        sim_p, sim_k = sim_pk.T
 
         if beta_e:
             a = 0.867
             b = 3.03
-            sim_e = np.random.beta(a, b, size=num_sim)
+            sim_e = rng.beta(a, b, size=num_sim)
         else:
             if e1 == e2:
                 sim_e = np.zeros(num_sim) + e1
             else:
-                sim_e = np.random.uniform(e1, e2, size=num_sim)
+                sim_e = rng.uniform(e1, e2, size=num_sim)
 
-        sim_tp = np.random.uniform(0, sim_p, size=num_sim)
-        sim_om = np.random.uniform(0, 2 * np.pi, size=num_sim)
+        sim_tp = rng.uniform(0, sim_p, size=num_sim)
+        sim_om = rng.uniform(0, 2 * np.pi, size=num_sim)
 
         df = pd.DataFrame(dict(inj_period=sim_p, inj_tp=sim_tp, inj_e=sim_e,
                                inj_w=sim_om, inj_k=sim_k))
@@ -107,24 +140,6 @@ class Injections(object):
 
         """
 
-        def _run_one(orbel):
-            sfile = open(self.searchpath, 'rb')
-            search = pickle.load(sfile)
-            search.verbose = False
-            sfile.close()
-
-            recovered, recovered_orbel = search.inject_recover(orbel, num_cpus=1, full_grid=self.full_grid)
-
-            last_bic = max(search.best_bics.keys())
-            bic = search.best_bics[last_bic]
-            thresh = search.bic_threshes[last_bic]
-
-            if self.verbose:
-                counter.value += 1
-                pbar.update_to(counter.value)
-
-            return recovered, recovered_orbel, bic, thresh
-
         outcols = ['inj_period', 'inj_tp', 'inj_e', 'inj_w', 'inj_k',
                    'rec_period', 'rec_tp', 'rec_e', 'rec_w', 'rec_k',
                    'recovered', 'bic']
@@ -132,13 +147,7 @@ class Injections(object):
                              columns=outcols)
         outdf[self.injected_planets.columns] = self.injected_planets
 
-        in_orbels = []
-        out_orbels = []
-        recs = []
-        bics = []
-        threshes = []
-        for i, row in self.injected_planets.iterrows():
-            in_orbels.append(list(row.values))
+        in_orbels = self.injected_planets.values.tolist()
 
         if self.verbose:
             global pbar
@@ -147,22 +156,22 @@ class Injections(object):
             counter = Value('i', 0, lock=True)
             pbar = TqdmUpTo(total=len(in_orbels), position=0)
 
-        pool = mp.Pool(processes=num_cpus)
+        pool = mp.Pool(processes=num_cpus, initializer=_init_injection_worker,
+                       initargs=(self.searchpath, self.full_grid, self.verbose))
         outputs = pool.map(_run_one, in_orbels)
 
-        for out in outputs:
+        out_orbels = np.empty((self.num_sim, 5))
+        recs = np.empty(self.num_sim, dtype=bool)
+        bics = np.empty(self.num_sim)
+        threshes = np.empty(self.num_sim)
+        for i, out in enumerate(outputs):
             recovered, recovered_orbel, bic, thresh = out
-            out_orbels.append(recovered_orbel)
-            recs.append(recovered)
-            bics.append(bic)
-            threshes.append(thresh)
-
-        out_orbels = np.array(out_orbels)
-        outdf['rec_period'] = out_orbels[:, 0]
-        outdf['rec_tp'] = out_orbels[:, 1]
-        outdf['rec_e'] = out_orbels[:, 2]
-        outdf['rec_w'] = out_orbels[:, 3]
-        outdf['rec_k'] = out_orbels[:, 4]
+            out_orbels[i] = recovered_orbel
+            recs[i] = recovered
+            bics[i] = bic
+            threshes[i] = thresh
+
+        outdf[['rec_period', 'rec_tp', 'rec_e', 'rec_w', 'rec_k']] = out_orbels
 
         outdf['recovered'] = recs
         outdf['bic'] = bics
@@ -252,36 +261,49 @@ class Completeness(object):
                             np.log10(ylim[1]),
                             resolution)
 
-        xinj = self.recoveries[self.xcol]
-        yinj = self.recoveries[self.ycol]
-
-        good = self.recoveries['recovered']
-
-        z = np.zeros((len(ygrid), len(xgrid)))
-        last = 0
-        for i,x in enumerate(xgrid):
-            for j,y in enumerate(ygrid):
-                xlow = 10**(np.log10(x) - xlogwin/2)
-                xhigh = 10**(np.log10(x) + xlogwin/2)
-                ylow = 10**(np.log10(y) - ylogwin/2)
-                yhigh = 10**(np.log10(y) + ylogwin/2)
-
-                xbox = yinj[np.where((xinj <= xhigh) & (xinj >= xlow))[0]]
-                if len(xbox) == 0 or y > max(xbox) or y < min(xbox):
-                    z[j, i] = np.nan
-                    continue
-
-                boxall = np.where((xinj <= xhigh) & (xinj >= xlow) &
-                                  (yinj <= yhigh) & (yinj >= ylow))[0]
-                boxgood = np.where((xinj[good] <= xhigh) &
-                                   (xinj[good] >= xlow) & (yinj[good] <= yhigh) &
-                                   (yinj[good] >= ylow))[0]
-                # print(x, y, xlow, xhigh, ylow, yhigh, len(boxgood), len(boxall))
-                if len(boxall) > 10:
-                    z[j, i] = float(len(boxgood))/len(boxall)
-                    last = float(len(boxgood))/len(boxall)
-                else:
-                    z[j, i] = np.nan
+        yinj_all = self.recoveries[self.ycol].to_numpy(float)
+        good_all = self.recoveries['recovered'].to_numpy(bool)
+        lxinj = np.log10(self.recoveries[self.xcol].to_numpy(float))
+        lyinj = np.log10(yinj_all)
+
+        lxg = np.log10(xgrid)[:, None]
+        lyg = np.log10(ygrid)[:, None]
+
+        nall = np.zeros((len(xgrid), len(ygrid)))
+        ngood = np.zeros((len(xgrid), len(ygrid)))
+        ymax = np.full(len(xgrid), -np.inf)
+        ymin = np.full(len(xgrid), np.inf)
+
+        # Accumulate over blocks of injections so that the per-block
+        # (resolution, block) arrays stay small for very large suites.
+        block = 100000
+        for start in range(0, len(lxinj), block):
+            lx = lxinj[start:start+block]
+            ly = lyinj[start:start+block]
+            yinj = yinj_all[start:start+block]
+            good = good_all[start:start+block]
+
+            # Masks flagging the injections that fall inside the
+            # moving-average window centered on each grid point.
+            xmask = (lx >= lxg - xlogwin/2) & (lx <= lxg + xlogwin/2)
+            ymask = (ly >= lyg - ylogwin/2) & (ly <= lyg + ylogwin/2)
+
+            # Count injections in every (x, y) window with two matrix products
+            # rather than materializing a (resolution, resolution, N) mask.
+            xweight = xmask.astype(float)
+            yweight = ymask.astype(float).T
+            nall += np.dot(xweight, yweight)
+            ngood += np.dot(xweight * good, yweight)
+
+            # Track the range of injected y values in each x window.
+            ymax = np.maximum(ymax, np.where(xmask, yinj, -np.inf).max(axis=1))
+            ymin = np.minimum(ymin, np.where(xmask, yinj, np.inf).min(axis=1))
+
+        # Blank out cells beyond the range of injected y values in the x window.
+        outside = (ygrid > ymax[:, None]) | (ygrid < ymin[:, None])
+
+        z = np.where((nall > 10) & ~outside,
+                     ngood / np.maximum(nall, 1), np.nan).T
 
         self.grid = (xgrid, ygrid, z)
 
@@ -304,7 +326,6 @@ class Completeness(object):
         """
         if self.interpolator is None or refresh:
             assert self.grid is not None, "Must run Completeness.completeness_grid before interpolating."
-            gi = rvsearch.utils.cartesian_product(self.grid[0], self.grid[1])
             zi = self.grid[2].T
             self.interpolator = RegularGridInterpolator((self.grid[0], self.grid[1]), zi)
 
@@ -3,7 +3,7 @@ import pdb
 
 import numpy as np
 import matplotlib.pyplot as plt
-import astropy.stats
+from astropy.timeseries import LombScargle
 import matplotlib.pyplot as plt
 import matplotlib.ticker as ticker
 
@@ -35,6 +35,21 @@ class TqdmUpTo(tqdm):
         self.update(b * bsize - self.n)  # will also set self.n = b * bsize
 
 
+# Periodogram handed to each per_bic worker process by _init_fit_worker.
+_worker_periodogram = None
+
+
+def _init_fit_worker(perioder):
+    """Store the Periodogram once per worker process."""
+    global _worker_periodogram
+    _worker_periodogram = perioder
+
+
+def _fit_period_worker(n):
+    """Fit period subgrid n with the Periodogram stored in this worker."""
+    return _worker_periodogram.fit_period(n)
+
+
 class Periodogram(object):
     """Class to calculate and store periodograms.
 
@@ -69,7 +84,7 @@ class Periodogram(object):
         self.times = self.post.likelihood.x
         self.vel = self.post.likelihood.y
         self.errvel = self.post.likelihood.yerr
-        self.timelen = np.amax(self.times) - np.amin(self.times)
+        self.timelen = np.ptp(self.times)
 
         self.tels = np.unique(self.post.likelihood.telvec)
         '''
@@ -185,6 +200,7 @@ class Periodogram(object):
                 baseline_bic = self.post.likelihood.bic()
         else:
             baseline_bic = self.basebic
+        self.baseline_bic = baseline_bic
 
         rms = np.std(self.post.likelihood.residuals())
         self.default_pdict['k{}'.format(self.post.params.num_planets)] = rms
@@ -206,53 +222,6 @@ class Periodogram(object):
         # Divide period grid into as many subgrids as there are parallel workers.
         self.sub_pers = np.array_split(self.pers, self.workers)
 
-        # Define a function to compute periodogram for a given grid section.
-        def _fit_period(n):
-            post = copy.deepcopy(self.post)
-            per_array = self.sub_pers[n]
-            fit_params = [{} for x in range(len(per_array))]
-            bic = np.zeros_like(per_array)
-
-            for i, per in enumerate(per_array):
-                # Reset posterior parameters to default values.
-                for k in self.default_pdict.keys():
-                    post.params[k].value = self.default_pdict[k]
-                perkey = 'per{}'.format(self.num_known_planets+1)
-                post.params[perkey].value = per
-                post = radvel.fitting.maxlike_fitting(post, verbose=False)
-                bic[i] = baseline_bic - post.likelihood.bic()
-
-                if bic[i] < self.floor - 1:
-                    # If the fit is bad, reset k_n+1 = 0 and try again.
-                    for k in self.default_pdict.keys():
-                        post.params[k].value = self.default_pdict[k]
-                    post.params[perkey].value = per
-                    post.params['k{}'.format(post.params.num_planets)].value = 0
-                    post = radvel.fitting.maxlike_fitting(post, verbose=False)
-                    bic[i] = baseline_bic - post.likelihood.bic()
-
-                if bic[i] < self.floor - 1:
-                    # If the fit is still bad, reset tc to better value and try again.
-                    for k in self.default_pdict.keys():
-                        post.params[k].value = self.default_pdict[k]
-                    veldiff = np.absolute(post.likelihood.y - np.median(post.likelihood.y))
-                    tc_new = self.times[np.argmin(veldiff)]
-                    post.params['tc{}'.format(post.params.num_planets)].value = tc_new
-                    post = radvel.fitting.maxlike_fitting(post, verbose=False)
-                    bic[i] = baseline_bic - post.likelihood.bic()
-
-                # Append the best-fit parameters to the period-iterated list.
-                best_params = {}
-                for k in post.params.keys():
-                    best_params[k] = post.params[k].value
-                fit_params[i] = best_params
-
-                if self.verbose:
-                    counter.value += 1
-                    pbar.update_to(counter.value)
-
-            return (bic, fit_params)
-
         if self.verbose:
             global pbar
             global counter
@@ -262,11 +231,14 @@ class Periodogram(object):
 
         if self.workers == 1:
             # Call the periodogram loop on one core.
-            self.bic, self.fit_params = _fit_period(0)
+            self.bic, self.fit_params = self.fit_period(0)
         else:
             # Parallelize the loop over sections of the period grid.
-            p = mp.Pool(processes=self.workers)
-            output = p.map(_fit_period, (np.arange(self.workers)))
+            # Each worker receives the Periodogram once, at startup, rather
+            # than with every task.
+            p = mp.Pool(processes=self.workers, initializer=_init_fit_worker,
+                        initargs=(self,))
+            output = p.map(_fit_period_worker, (np.arange(self.workers)))
 
             # Sort output.
             all_bics = []
@@ -288,14 +260,84 @@ class Periodogram(object):
         if self.verbose:
             pbar.close()
 
+    def fit_period(self, n):
+        """Compute the delta-BIC periodogram over one section of the period grid.
+
+        Args:
+            n (int): index of the period subgrid in self.sub_pers
+
+        Returns:
+            tuple: (array of delta-BIC values, list of best-fit parameter dicts)
+
+        """
+        # Fit in place: self.post is private to each worker process (a
+        # forked or unpickled copy), and to the caller when workers == 1.
+        # Default values are restored before every trial period and once more
+        # at the end, but the fits leave extra synth-basis keys (tp, e, w) in
+        # self.post.params, so it is not pristine after per_bic.
+        post = self.post
+        per_array = self.sub_pers[n]
+        fit_params = [{} for x in range(len(per_array))]
+        bic = np.zeros_like(per_array)
+
+        # Build parameter keys and default values once, outside the grid loop.
+        default_items = tuple(self.default_pdict.items())
+        perkey = 'per{}'.format(self.num_known_planets+1)
+        kkey = 'k{}'.format(self.num_known_planets+1)
+        tckey = 'tc{}'.format(self.num_known_planets+1)
+
+        # Fallback tc guess for bad fits; it does not depend on the period.
+        veldiff = np.absolute(post.likelihood.y - np.median(post.likelihood.y))
+        tc_new = self.times[np.argmin(veldiff)]
+
+        def _try_fit(per, k=None, tc=None):
+            # Reset to the default values, apply the starting guesses for the
+            # trial planet, fit, and return the delta-BIC. With per=None the
+            # default period is kept.
+            for key, v in default_items:
+                post.params[key].value = v
+            if per is not None:
+                post.params[perkey].value = per
+            if k is not None:
+                post.params[kkey].value = k
+            if tc is not None:
+                post.params[tckey].value = tc
+            radvel.fitting.maxlike_fitting(post, verbose=False)
+            return self.baseline_bic - post.likelihood.bic()
+
+        for i, per in enumerate(per_array):
+            bic[i] = _try_fit(per)
+
+            if bic[i] < self.floor - 1:
+                # If the fit is bad, reset k_n+1 = 0 and try again.
+                bic[i] = _try_fit(per, k=0)
+
+            if bic[i] < self.floor - 1:
+                # If the fit is still bad, reset tc to better value and try again.
+                bic[i] = _try_fit(None, tc=tc_new)
+
+            # Append the best-fit parameters to the period-iterated list.
+            best_params = {}
+            for k in post.params.keys():
+                best_params[k] = post.params[k].value
+            fit_params[i] = best_params
+
+            if self.verbose:
+                counter.value += 1
+                pbar.update_to(counter.value)
+
+        for k, v in default_items:
+            post.params[k].value = v
+
+        return (bic, fit_params)
+
     def ls(self):
         """Compute Lomb-Scargle periodogram with astropy.
 
         """
         # FOR TESTING
         print("Calculating Lomb-Scargle periodogram")
-        periodogram = astropy.stats.LombScargle(self.times, self.vel,
-                                                self.errvel)
+        periodogram = LombScargle(self.times, self.vel, self.errvel)
         power = periodogram.power(np.flip(self.freqs))
         self.power['ls'] = power
 
@@ -307,9 +349,13 @@ class Periodogram(object):
             Modified version by JB Ruffio (2022-02-17) based on the integral of an exponential decay.
 
         """
-        sBIC = np.sort(self.power['bic'])
-        crop_BIC = sBIC[int(0.5 * len(sBIC)):int(0.95 * len(sBIC))]
-        med_BIC = crop_BIC[0]
+        # Only the 50th-95th percentile slice and the maximum are needed, so
+        # partition around those ranks instead of sorting the whole array.
+        BIC = np.asarray(self.power['bic'])
+        lo, hi = int(0.5 * len(BIC)), int(0.95 * len(BIC))
+        pBIC = np.partition(BIC, (lo, hi))
+        crop_BIC = pBIC[lo:hi]
+        med_BIC = pBIC[lo]
 
         hist, edge = np.histogram(crop_BIC-med_BIC, bins=10)
         cent = (edge[1:] + edge[:-1]) / 2.
@@ -320,7 +366,7 @@ class Periodogram(object):
         A=-a*np.log(10)
 
         self.bic_thresh = np.log(self.fap / self.num_pers) / (-A)+med_BIC
-        self.fap_min = np.exp(-A*(sBIC[-1]-med_BIC)) * self.num_pers
+        self.fap_min = np.exp(-A*(np.amax(BIC)-med_BIC)) * self.num_pers
 
     def save_per(self, filename, ls=False):
         df = pd.DataFrame([])
@@ -347,28 +393,32 @@ class Periodogram(object):
 
         """
         # TO-DO: WORK IN AIC/BIC OPTION, INCLUDE IN PLOT TITLE
-        peak = np.argmax(self.power['bic'])
+        # Convert once and reuse the extrema for the peak and axis limits.
+        pbic = np.asarray(self.power['bic'])
+        peak = np.argmax(pbic)
+        pbic_max = pbic[peak]
+        pbic_min = np.amin(pbic)
         f_real = self.freqs[peak]
 
         fig, ax = plt.subplots()
-        ax.plot(self.pers, self.power['bic'])
-        ax.scatter(self.pers[peak], self.power['bic'][peak], label='{} days'\
+        ax.plot(self.pers, pbic)
+        ax.scatter(self.pers[peak], pbic_max, label='{} days'\
                             .format(np.round(self.pers[peak], decimals=1)))
 
         # If DBIC threshold has been calculated, plot.
         if self.bic_thresh is not None:
             ax.axhline(self.bic_thresh, ls=':', c='y', label='{} FAP'\
                                                     .format(self.fap))
-            upper = 1.1*max(np.amax(self.power['bic']), self.bic_thresh)
+            upper = 1.1*max(pbic_max, self.bic_thresh)
         else:
-            upper = 1.1*np.amax(self.power['bic'])
+            upper = 1.1*pbic_max
 
         if floor:
             # Set periodogram plot floor according to circular-fit BIC min.
             # Set this until we figure out how to fix known planet offset. 5/8
-            lower = max(self.floor, np.amin(self.power['bic']))
+            lower = max(self.floor, pbic_min)
         else:
-            lower = np.amin(self.power['bic'])
+            lower = pbic_min
 
         ax.set_ylim([lower, upper])
         ax.set_xlim([self.pers[0], self.pers[-1]])
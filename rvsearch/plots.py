@@ -302,10 +302,9 @@ class PeriodModelPlot(radvel.plot.orbit_plots.MultipanelPlot):
             min = np.amax([3, np.amin(self.pers)])
             max = baseline/2
 
-            window_safe = window[np.where(np.logical_and(
-                                          self.pers < max, self.pers > min))]
-            pers_safe   = self.pers[np.where(np.logical_and(
-                                             self.pers < max, self.pers > min))]
+            safe        = (self.pers < max) & (self.pers > min)
+            window_safe = window[safe]
+            pers_safe   = self.pers[safe]
 
             # skip plotting if baseline < min search period
             if len(window_safe) == 0:
@@ -365,7 +365,7 @@ class Search(object):
         # Generalized Lomb-Scargle version; functional, but seems iffy.
         # Subtract off gammas and trend terms.
         for tel in self.tels:
-            y[np.where(tels == tel)] -= self.post.params['gamma_{}'.format(tel)].value
+            y[tels == tel] -= self.post.params['gamma_{}'.format(tel)].value
 
         if self.post.params['dvdt'].vary == True:
             y -= self.post.params['dvdt'].value * (x - self.post.likelihood.model.time_base)
@@ -159,9 +159,14 @@ def window(times, freqs, plot=False):
         time: times of observations in a dataset. FOR SEPARATE TELESCOPES?
 
     """
+    freqs = np.asarray(freqs)
+    phase = -2*np.pi*1j*np.asarray(times)
     W = np.zeros(len(freqs))
-    for i, freq in enumerate(freqs):
-        W[i] = np.absolute(np.sum(np.exp(-2*np.pi*1j*times*freq)))
+    # Evaluate blocks of frequencies at once, bounding the phase matrix size.
+    block = 1024
+    for i in range(0, len(freqs), block):
+        phases = np.exp(np.outer(freqs[i:i+block], phase))
+        W[i:i+block] = np.absolute(np.sum(phases, axis=1))
     W /= float(len(times))
     return W
 